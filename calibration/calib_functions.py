@@ -2,6 +2,12 @@
 import warnings
 import numpy as np
 
+# Conversion factor from radians to degrees
+_RAD2DEG = 180.0 / np.pi
+
+# Minimax coefficients of atan(t) on [-1, 1], used by fast_atan2
+_ATAN_COEFFICIENTS = (0.99997726, -0.33262347, 0.19354346, -0.11643287, 0.05265332, -0.01172120)
+
 
 def normalize_angle(x):
     """
@@ -12,45 +18,78 @@ def normalize_angle(x):
     return (x + 180) % 360 - 180
 
 
-def calculate_expected_angles(camera_data, points):
+def fast_atan2(y, x):
+    """
+    Approximates np.arctan2 element-wise with a minimax polynomial, without branches on the inputs.
+    The maximum absolute error is about 2e-6 radians (about 1e-4 degrees).
+    @param y: (float or array-like) y-coordinates
+    @param x: (float or array-like) x-coordinates
+    @return: (numpy.ndarray) Angles in radians in the range [-pi, pi]
+    """
+    y = np.asarray(y, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+
+    # Reduce the argument to [-1, 1], swapping x and y when |y| > |x|
+    swap = np.abs(x) < np.abs(y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(swap, x / y, y / x)
+
+    # Resolve the indeterminate ratios before the quadrant shift, atan2(+-0, +-0) reduces to t = +-0 and
+    # atan2(+-inf, +-inf) to t = +-1, while NaN inputs propagate
+    t = np.where((x == 0) & (y == 0), np.copysign(0.0, y), t)
+    t = np.where(np.isinf(x) & np.isinf(y), np.copysign(1.0, y) * np.copysign(1.0, x), t)
+
+    # Approximate atan(t) on [-1, 1] by an odd polynomial (Horner scheme)
+    t2 = t * t
+    a1, a3, a5, a7, a9, a11 = _ATAN_COEFFICIENTS
+    result = t * (a1 + t2 * (a3 + t2 * (a5 + t2 * (a7 + t2 * (a9 + t2 * a11)))))
+
+    # Undo the argument reduction, atan2(y, x) = sign(y) * pi/2 - atan(x/y) when swapped, and otherwise move the
+    # result to the left half-plane when x is negative (including -0.0)
+    unswapped = np.where(np.signbit(x), result + np.copysign(np.pi, y), result)
+    return np.where(swap, np.copysign(np.pi / 2, y) - result, unswapped)
+
+
+def calculate_expected_angles(camera_data, points, fast=False):
     """
     Calculates the expected azimuth and elevation angles for a set of points relative to a camera position and
     orientation.
 
     @param camera_data: (dict) A dictionary containing the position and orientation in degrees of the camera.
-    @param points: (array-like) A list or array of (x, y, z) coordinates for the points of interest.
-    @return: (list of floats) A list of expected azimuth and elevation angles (in degrees) for the given points relative
-             to the camera position and orientation.
+    @param points: (array-like) A single (x, y[, z]) point, or a list or array of such points.
+    @param fast: (bool) If True, use the fast_atan2 approximation instead of np.arctan2.
+    @return: (tuple of numpy.ndarray) The expected azimuth and elevation angles (in degrees) for the given points
+             relative to the camera position and orientation.
     """
-    if not isinstance(points, list):
-        points = [points]
-    # Check that each point in points is a tuple of length 2
-    if any(not isinstance(p, tuple) or (len(p) != 2 and len(p) != 3) for p in points):
+    # Check that points is a single point or a sequence of points of length 2 or 3
+    try:
+        pts = np.atleast_2d(np.asarray(points, dtype=np.float64))
+    except (ValueError, TypeError):
+        raise TypeError("Each point in points must be a tuple of length 2 or 3.")
+    if pts.ndim != 2 or pts.shape[1] not in (2, 3):
         raise TypeError("Each point in points must be a tuple of length 2 or 3.")
 
-    camera_position = camera_data['position']
+    camera_position = np.asarray(camera_data['position'], dtype=np.float64)
     camera_azimuth = camera_data['azimuth']
     camera_elevation = camera_data['elevation']
 
-    expected_azimuths = []
-    expected_elevations = []
-    for point in points:
-        x = point[0]
-        y = point[1]
-        z = 0 if len(point) == 2 else point[2]  # Set z to 0 if it is not provided
-        delta_x = x - camera_position[0]  # Calculate the difference in x coordinates
-        delta_y = y - camera_position[1]  # Calculate the difference in y coordinates
-        delta_z = z - camera_position[2]  # Calculate the difference in z coordinates
+    if pts.shape[1] == 2:
+        pts = np.column_stack([pts, np.zeros((pts.shape[0], 1))])  # Set z to 0 if it is not provided
+
+    arctan2 = fast_atan2 if fast else np.arctan2
+
+    # Calculate the differences in x, y and z coordinates for all points at once
+    deltas = pts - camera_position
 
-        # Calculate the azimuth angle:
-        azimuth = np.rad2deg(np.arctan2(delta_y, delta_x)) - camera_azimuth
+    # Calculate the azimuth angles:
+    expected_azimuths = arctan2(deltas[:, 1], deltas[:, 0]) * _RAD2DEG - camera_azimuth
 
-        # Calculate the elevation angle:
-        elevation = np.rad2deg(np.arctan2(delta_z, np.sqrt(delta_x ** 2 + delta_y ** 2))) - camera_elevation
+    # Calculate the elevation angles:
+    expected_elevations = arctan2(deltas[:, 2], np.hypot(deltas[:, 0], deltas[:, 1])) * _RAD2DEG - \
+        camera_elevation
 
-        # Append the calculated angles to the list of expected angles
-        expected_azimuths.append(normalize_angle(azimuth))
-        expected_elevations.append(normalize_angle(elevation))
+    expected_azimuths = normalize_angle(expected_azimuths)
+    expected_elevations = normalize_angle(expected_elevations)
 
     long_return = (expected_azimuths, expected_elevations)
     short_return = (expected_azimuths[0], expected_elevations[0])
@@ -62,32 +101,51 @@ def calculate_calibration_params(measured_pixels, expected_angles, fit_degree=1)
    Calculates the calibration parameters for converting measured pixel values to expected angle values.
 
     @param measured_pixels: array-like
-        A one-dimensional array containing measured pixel values.
+        A one-dimensional array containing measured pixel values. For a linear fit, a two-dimensional array may be
+        passed to fit each column independently (e.g. azimuth and elevation pixels of a camera).
     @param expected_angles: array-like
-        A one-dimensional array containing expected angle values.
+        An array containing expected angle values, of the same shape as measured_pixels.
     @param fit_degree: int
         An integer indicating the degree of polynomial fit to use.
     @return: tuple of floats
-        The slope, intercept, and R^2 value for the fitted polynomial.
+        The slope, intercept, and R^2 value for the fitted polynomial (arrays with one value per column for
+        two-dimensional input).
     """
 
     # Check that the input arrays have the same length
     if len(measured_pixels) != len(expected_angles):
         raise ValueError("measured_pixels and expected_angles must have the same number of elements.")
 
-    # Fit a polynomial to the measured pixel values and expected angle values
-    coefficients, residuals, _, _, _, = np.polyfit(measured_pixels, expected_angles, deg=fit_degree, full=True)
-    slope = coefficients[0]
-    intercept = coefficients[1]
-    residuals = residuals[0]
+    if fit_degree == 1:
+        # Closed-form least-squares line, computed from the centered sums of squares
+        x = np.asarray(measured_pixels, dtype=np.float64)
+        y = np.asarray(expected_angles, dtype=np.float64)
+        x_mean = x.mean(axis=0)
+        y_mean = y.mean(axis=0)
+        dx = x - x_mean
+        dy = y - y_mean
+        sxx = (dx * dx).sum(axis=0)
+        sxy = (dx * dy).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        r_squared = (sxy * sxy) / (sxx * syy)
+    else:
+        # Fit a polynomial to the measured pixel values and expected angle values
+        coefficients, residuals, _, _, _, = np.polyfit(measured_pixels, expected_angles, deg=fit_degree, full=True)
+        slope = coefficients[0]
+        intercept = coefficients[1]
+        residuals = residuals[0]
 
-    # Compute R^2
-    total_sum_of_squares = sum((expected_angles - np.mean(expected_angles)) ** 2)
-    r_squared = 1 - (residuals / total_sum_of_squares)
+        # Compute R^2
+        y = np.asarray(expected_angles, dtype=np.float64)
+        total_sum_of_squares = y.var() * y.size
+        r_squared = 1 - (residuals / total_sum_of_squares)
 
     # Warn if R^2 value is too small
-    if r_squared < 0.95:
-        warnings.warn(f"too small residual (R^2 = {r_squared:0.3f})")
+    if np.any(r_squared < 0.95):
+        warnings.warn(f"too small residual (R^2 = {np.min(r_squared):0.3f})")
 
     return slope, intercept, r_squared
 
@@ -104,13 +162,34 @@ def pixel2phi(calibration_data, pixel):
     if isinstance(pixel, int):
         # Extract the calibration parameters for the camera
         slope, intercept, _ = calibration_data
-
-        # Convert the pixel coordinate to an angle using the slope and intercept
-        phi = slope * pixel + intercept
-
-        return phi
+        return pixel2phi_scalar(slope, intercept, pixel)
     elif isinstance(pixel, tuple) and len(pixel) == 2:
-        return pixel2phi(calibration_data['azimuth'], pixel[0]), pixel2phi(calibration_data['elevation'], pixel[1])
+        return pixel2phi_pair(calibration_data['azimuth'], calibration_data['elevation'], pixel[0], pixel[1])
     else:
         raise TypeError("pixel must be an integer or tuple of length 2.")
 
+
+def pixel2phi_scalar(slope, intercept, pixel):
+    """
+    Converts a pixel coordinate along one axis to the corresponding angle in degrees.
+
+    @param slope: (float) The slope of the calibration of the axis.
+    @param intercept: (float) The intercept of the calibration of the axis.
+    @param pixel: (int or numpy.ndarray) The pixel coordinate (or coordinates) to convert to an angle.
+    @return: Angle in degrees corresponding to the given pixel coordinate.
+    """
+    return slope * pixel + intercept
+
+
+def pixel2phi_pair(azimuth_calibration, elevation_calibration, pixel_horizontal, pixel_vertical):
+    """
+    Converts a (horizontal, vertical) pixel coordinate to the corresponding azimuth and elevation angles in degrees.
+
+    @param azimuth_calibration: (tuple) The slope, intercept, and R^2 value of the azimuth calibration.
+    @param elevation_calibration: (tuple) The slope, intercept, and R^2 value of the elevation calibration.
+    @param pixel_horizontal: (int or numpy.ndarray) The horizontal pixel coordinate.
+    @param pixel_vertical: (int or numpy.ndarray) The vertical pixel coordinate.
+    @return: (tuple) Azimuth and elevation angles in degrees corresponding to the given pixel coordinate.
+    """
+    return (azimuth_calibration[0] * pixel_horizontal + azimuth_calibration[1],
+            elevation_calibration[0] * pixel_vertical + elevation_calibration[1])
@@ -7,23 +7,45 @@ import math
 from calibration.calib_functions import calculate_expected_angles
 import deprecation
 
+# Conversion factor from degrees to radians
+_DEG2RAD = math.pi / 180.0
+
+# Relative tolerance below which the 2x2 system of the closest point between two lines is deemed singular, i.e.
+# the squared sine of the angle between the lines
+_SINGULARITY_TOLERANCE = 1e-12
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # Numba is optional, the kernels below then run as plain Python
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
 def tand(x):
     """
     Calculates the tangent of an angle in degrees.
-    @param x : (float) Angle in degrees
-    @return: (float) Tangent of the angle
+    @param x : (float or numpy.ndarray) Angle in degrees
+    @return: (float or numpy.ndarray) Tangent of the angle
     """
-    return np.tan(np.deg2rad(x))
+    if isinstance(x, (int, float)):
+        return math.tan(x * _DEG2RAD)
+    return np.tan(np.asarray(x, dtype=np.float64) * _DEG2RAD)
 
 
 @deprecation.deprecated(details="\nThis function is deprecated. Use closest_point_between_lines instead.")
-def triangulation(camera_a_data, sight_angle_a, camera_b_data, sight_angle_b):
+def triangulation(camera_a_data, sight_angle_a, camera_b_data, sight_angle_b, out=None):
     """
     Computes the estimated X and Y coordinates of an object using triangulation method.
     @param camera_a_data: (dict) A dictionary containing the position and azimuth angle of camera A.
     @param sight_angle_a: (float) The sight angle of camera A to the object in degrees.
     @param camera_b_data: (dict) A dictionary containing the position and azimuth angle of camera B.
     @param sight_angle_b: (float) The sight angle of camera B to the object in degrees.
+    @param out: (numpy.ndarray, optional) A preallocated array of length 2 to store the result in.
     @return: (numpy.ndarray) An array containing the estimated X and Y coordinates of the object.
     """
     # Rearrange data
@@ -32,14 +54,61 @@ def triangulation(camera_a_data, sight_angle_a, camera_b_data, sight_angle_b):
     x_b, y_b = camera_b_data['position'][:2]
     az_b = camera_b_data['azimuth']
 
-    # Calculate the tangent of the azimuth angles
-    tan_phi_a = tand(az_a + sight_angle_a)
-    tan_phi_b = tand(az_b + sight_angle_b)
+    x, y = _triangulate(x_a, y_a, az_a + sight_angle_a, x_b, y_b, az_b + sight_angle_b)
+    if out is None:
+        return np.array([x, y])
+    out[0] = x
+    out[1] = y
+    return out
+
+
+@njit(cache=True)
+def _triangulate(x_a, y_a, phi_a, x_b, y_b, phi_b):
+    """
+    Scalar triangulation kernel, compiled with Numba when it is available.
+    @param x_a, y_a: (float) Position of camera A.
+    @param phi_a: (float) Absolute sight angle of camera A in degrees.
+    @param x_b, y_b: (float) Position of camera B.
+    @param phi_b: (float) Absolute sight angle of camera B in degrees.
+    @return: (tuple) The estimated X and Y coordinates of the object.
+    """
+    return _triangulate_by_tangents(x_a, y_a, math.tan(phi_a * _DEG2RAD), x_b, y_b, math.tan(phi_b * _DEG2RAD))
+
+
+@njit(cache=True)
+def _triangulate_by_tangents(x_a, y_a, tan_phi_a, x_b, y_b, tan_phi_b):
+    """
+    Scalar triangulation kernel taking the tangents of the absolute sight angles.
+    @return: (tuple) The estimated X and Y coordinates of the object.
+    """
+    # Parallel sight lines give an infinite estimate, as numpy float division would, instead of ZeroDivisionError
+    tan_difference = tan_phi_a - tan_phi_b
+    inverse = 1 / tan_difference if tan_difference != 0 else math.copysign(math.inf, tan_difference)
 
     # Calculate the estimated X and Y coordinates of the object
-    x = 1 / (tan_phi_a - tan_phi_b) * (x_a * tan_phi_a - x_b * tan_phi_b - (y_a - y_b))
+    x = inverse * (x_a * tan_phi_a - x_b * tan_phi_b - (y_a - y_b))
     y = tan_phi_a * (x - x_a) + y_a
-    return np.array([x, y])
+    return x, y
+
+
+@njit(cache=True)
+def _max_triangulation_error(x_a, y_a, phi_a, x_b, y_b, phi_b, delta, x_t, y_t):
+    """
+    Scalar kernel of get_error, compiled with Numba when it is available.
+    @return: (float) Maximum distance from (x_t, y_t) over the four +/- delta combinations of the sight angles.
+    """
+    # The four +/- delta combinations share only four distinct tangents
+    tan_a_plus = math.tan((phi_a + delta) * _DEG2RAD)
+    tan_a_minus = math.tan((phi_a - delta) * _DEG2RAD)
+    tan_b_plus = math.tan((phi_b + delta) * _DEG2RAD)
+    tan_b_minus = math.tan((phi_b - delta) * _DEG2RAD)
+
+    max_error = 0.0
+    for tan_phi_a, tan_phi_b in ((tan_a_plus, tan_b_plus), (tan_a_minus, tan_b_minus),
+                                 (tan_a_plus, tan_b_minus), (tan_a_minus, tan_b_plus)):
+        x, y = _triangulate_by_tangents(x_a, y_a, tan_phi_a, x_b, y_b, tan_phi_b)
+        max_error = max(max_error, math.hypot(x - x_t, y - y_t))
+    return max_error
 
 
 def triangulation_by_pairs(cameras_list, angle_by_camera):
@@ -66,46 +135,53 @@ def triangulation_by_pairs(cameras_list, angle_by_camera):
     else:
         raise TypeError("angle_by_camera values must be either int or tuple of two elements")
 
-    # Initialize the result array with zeros
-    result = np.zeros([math.comb(len(cameras_list), 2), dimensions + 1])
-    running_index = 0
-
-    # Perform triangulation for each pair of cameras
-    for i in range(len(cameras_list) - 1):
-        for j in range(i + 1, len(cameras_list)):
-            camera_a = cameras_list[i]
-            azimuth_a = angle_by_camera[camera_a['name']][0] + camera_a['azimuth']
-            elevation_a = angle_by_camera[camera_a['name']][1] + camera_a['elevation']
-
-            camera_b = cameras_list[j]
-            azimuth_b = angle_by_camera[camera_b['name']][0] + camera_b['azimuth']
-            elevation_b = angle_by_camera[camera_b['name']][1] + camera_b['elevation']
+    # Gather the positions and absolute sight angles of all cameras
+    positions, azimuths, elevations = cameras_to_arrays(cameras_list, angle_by_camera)
+    directions = _angles_to_unit_vectors(azimuths, elevations)
 
-            direction_a, direction_b = convert_angles_to_unit_vectors((azimuth_a, elevation_a),
-                                                                      (azimuth_b, elevation_b))
+    # Materialize the positions of both cameras of every pair once, both passes below share them
+    index_a, index_b = np.triu_indices(len(cameras_list), 1)
+    positions_a, positions_b = positions[index_a], positions[index_b]
 
-            point = closest_point_between_lines((camera_a['position'], direction_a),
-                                                (camera_b['position'], direction_b))
+    # Initialize the result array, one row per pair of cameras
+    result = np.empty([len(index_a), dimensions + 1])
 
-            result[running_index, :dimensions] = point
-            running_index += 1
+    # Perform triangulation for all pairs of cameras at once
+    result[:, :dimensions] = closest_points_between_line_pairs(positions_a, directions[index_a],
+                                                               positions_b, directions[index_b])
 
     # Calculate the mean point
     point = np.mean(result[:, :dimensions], axis=0)
 
-    running_index = 0
+    # Calculate the expected angles of each camera to the mean point once, as every camera takes part in several pairs
+    expected_angle_by_camera = {camera['name']: calculate_expected_angles(camera, tuple(point))
+                                for camera in cameras_list}
+    _, expected_azimuths, expected_elevations = cameras_to_arrays(cameras_list, expected_angle_by_camera)
+    expected_angles = np.column_stack([expected_azimuths, expected_elevations])
 
-    # Calculate the 3D error for each pair of cameras
-    for i in range(len(cameras_list) - 1):
-        for j in range(i + 1, len(cameras_list)):
-            camera_a = cameras_list[i]
-            camera_b = cameras_list[j]
-            result[running_index, dimensions] = calc_3d_error(camera_a, camera_b, delta=0.5, target_position=point)
-            running_index += 1
+    # Calculate the 3D error for all pairs of cameras at once
+    result[:, dimensions] = _calc_3d_errors(positions_a, expected_angles[index_a], positions_b,
+                                            expected_angles[index_b], delta=0.5, target_position=point)
 
     return result
 
 
+def cameras_to_arrays(cameras_list, angle_by_camera):
+    """
+    Converts a list of cameras and their sight angles to arrays, one entry per camera in the order of cameras_list.
+    @param cameras_list: (list) A list of dictionaries with keys 'name', 'azimuth', 'elevation', and 'position'.
+    @param angle_by_camera: (dict) A dictionary mapping camera names to (azimuth, elevation) sight angles in degrees.
+    @return: (tuple) The (n, 3) array of positions, and the (n,) arrays of absolute azimuths and elevations, which
+             are the sight angles added to the mounting angles of the cameras.
+    """
+    positions = np.array([camera['position'] for camera in cameras_list], dtype=np.float64)
+    angles = np.array([angle_by_camera[camera['name']] for camera in cameras_list], dtype=np.float64)
+    azimuths = angles[:, 0] + np.array([camera['azimuth'] for camera in cameras_list], dtype=np.float64)
+    elevations = angles[:, 1] + np.array([camera['elevation'] for camera in cameras_list], dtype=np.float64)
+
+    return positions, azimuths, elevations
+
+
 @deprecation.deprecated(details="\nThis function is deprecated. Use calc_3D_error instead.")
 def get_error(camera_a_data, camera_b_data, delta, target_position):
     """
@@ -114,24 +190,52 @@ def get_error(camera_a_data, camera_b_data, delta, target_position):
     @param camera_a_data: (dict) A dictionary containing the position and azimuth angle of camera A.
     @param camera_b_data: (dict) A dictionary containing the position and azimuth angle of camera B.
     @param delta: (float) Incremental value used to compute the error.
-    @param target_position: (numpy.array) True X and Y coordinates of the object.
-    @return: (float) Maximum error for the estimated position of the object.
+    @param target_position: (numpy.array) True X and Y coordinates of the object, or an (N, 2) or (N, 3) array of
+                            N positions.
+    @return: (float or numpy.ndarray) Maximum error for the estimated position of the object, or an array of N
+             errors when N positions are given.
     """
+    if np.ndim(target_position) == 2:
+        return _max_triangulation_errors(camera_a_data, camera_b_data, delta, target_position)
+
+    x_a, y_a = camera_a_data['position'][:2]
+    x_b, y_b = camera_b_data['position'][:2]
 
     # Expected azimuth angle of cameras A and B in degrees.
     azimuth_a = calculate_expected_angles(camera_a_data, tuple(target_position))[0]
     azimuth_b = calculate_expected_angles(camera_b_data, tuple(target_position))[0]
 
-    # Estimate object positions for each combination of expected azimuth angles
-    pp = triangulation(camera_a_data, azimuth_a + delta, camera_b_data, azimuth_b + delta)
-    mm = triangulation(camera_a_data, azimuth_a - delta, camera_b_data, azimuth_b - delta)
-    pm = triangulation(camera_a_data, azimuth_a + delta, camera_b_data, azimuth_b - delta)
-    mp = triangulation(camera_a_data, azimuth_a - delta, camera_b_data, azimuth_b + delta)
+    # Estimate object positions for each combination of expected azimuth angles and return the largest error
+    return _max_triangulation_error(x_a, y_a, camera_a_data['azimuth'] + azimuth_a,
+                                    x_b, y_b, camera_b_data['azimuth'] + azimuth_b,
+                                    delta, target_position[0], target_position[1])
+
+
+def _max_triangulation_errors(camera_a_data, camera_b_data, delta, target_positions):
+    """
+    Vectorized counterpart of _max_triangulation_error, evaluating get_error for N target positions at once.
+    @return: (numpy.ndarray) Maximum error for each of the N target positions.
+    """
+    x_a, y_a = camera_a_data['position'][:2]
+    x_b, y_b = camera_b_data['position'][:2]
+    target_positions = np.asarray(target_positions, dtype=np.float64)
+
+    # Absolute sight angles of cameras A and B towards every target, in degrees.
+    phi_a = camera_a_data['azimuth'] + np.atleast_1d(calculate_expected_angles(camera_a_data, target_positions)[0])
+    phi_b = camera_b_data['azimuth'] + np.atleast_1d(calculate_expected_angles(camera_b_data, target_positions)[0])
 
-    # Compute error for each estimated position and store in array
-    errors = np.linalg.norm(np.array([pp, mm, pm, mp]) - target_position[:2], axis=1)
+    # The four +/- delta combinations share only four distinct tangents
+    tan_a_plus, tan_a_minus = tand(phi_a + delta), tand(phi_a - delta)
+    tan_b_plus, tan_b_minus = tand(phi_b + delta), tand(phi_b - delta)
 
-    return max(errors)
+    errors = np.zeros(len(target_positions))
+    for tan_phi_a, tan_phi_b in ((tan_a_plus, tan_b_plus), (tan_a_minus, tan_b_minus),
+                                 (tan_a_plus, tan_b_minus), (tan_a_minus, tan_b_plus)):
+        x = 1 / (tan_phi_a - tan_phi_b) * (x_a * tan_phi_a - x_b * tan_phi_b - (y_a - y_b))
+        y = tan_phi_a * (x - x_a) + y_a
+        errors = np.maximum(errors, np.hypot(x - target_positions[:, 0], y - target_positions[:, 1]))
+
+    return errors
 
 
 def calc_3d_error(camera_a_data, camera_b_data, delta, target_position):
@@ -156,40 +260,52 @@ def calc_3d_error(camera_a_data, camera_b_data, delta, target_position):
     azimuth_b += camera_b_data['azimuth']
     elevation_b += camera_b_data['elevation']
 
-    deltas = [-delta, delta]
-    combinations = 2 ** 4
-    deviated_points = np.zeros([combinations, 3])
-
-    i = 0
-    for delta_azimuth_a in deltas:
-        for delta_elevation_a in deltas:
-            for delta_azimuth_b in deltas:
-                for delta_elevation_b in deltas:
-                    # Calculate the deviated azimuth and elevation for camera A and camera B
-                    deviated_azimuth_a = azimuth_a + delta_azimuth_a
-                    deviated_elevation_a = elevation_a + delta_elevation_a
-
-                    deviated_azimuth_b = azimuth_b + delta_azimuth_b
-                    deviated_elevation_b = elevation_b + delta_elevation_b
-
-                    angles_a = (deviated_azimuth_a, deviated_elevation_a)
-                    angles_b = (deviated_azimuth_b, deviated_elevation_b)
+    # Evaluate the single pair of cameras with the batched kernel
+    errors = _calc_3d_errors(np.array([camera_a_data['position']], dtype=np.float64),
+                             np.array([[azimuth_a, elevation_a]]),
+                             np.array([camera_b_data['position']], dtype=np.float64),
+                             np.array([[azimuth_b, elevation_b]]), delta, target_position)
 
-                    # Convert the deviated angles to unit vectors representing directions
-                    direction_a, direction_b = convert_angles_to_unit_vectors(angles_a, angles_b)
-
-                    line_a = (camera_a_data['position'], direction_a)
-                    line_b = (camera_b_data['position'], direction_b)
+    # Return the maximum error among all deviations
+    return errors[0]
 
-                    # Find the closest point between the lines defined by camera A and camera B
-                    deviated_points[i, :] = closest_point_between_lines(line_a, line_b)
-                    i += 1
 
-    # Calculate the errors as the Euclidean distance between each deviated point and the target position
+def _calc_3d_errors(positions_a, angles_a, positions_b, angles_b, delta, target_position):
+    """
+    Batched kernel of calc_3d_error for P pairs of cameras.
+
+    @param positions_a: (numpy.ndarray) A (P, 3) array of the positions of the A cameras.
+    @param angles_a: (numpy.ndarray) A (P, 2) array of the absolute azimuth and elevation of the A cameras towards the
+                     target position, in degrees.
+    @param positions_b: (numpy.ndarray) A (P, 3) array of the positions of the B cameras.
+    @param angles_b: (numpy.ndarray) A (P, 2) array of the absolute azimuth and elevation of the B cameras towards the
+                     target position, in degrees.
+    @param delta: (float) Delta value for calculating deviations.
+    @param target_position: (array-like) Target position in 3D space.
+    @return: (numpy.ndarray) Maximum 3D error of each pair of cameras.
+    """
+    # All 16 combinations of (azimuth A, elevation A, azimuth B, elevation B) deviations
+    deltas = [-delta, delta]
+    combinations = np.stack(np.meshgrid(deltas, deltas, deltas, deltas, indexing='ij'), -1).reshape(-1, 4)
+    number_of_combinations = len(combinations)
+
+    # Convert the deviated angles of every pair and combination to unit vectors, as rows of shape (P * 16, 3)
+    directions_a = _angles_to_unit_vectors((angles_a[:, [0]] + combinations[:, 0]).ravel(),
+                                           (angles_a[:, [1]] + combinations[:, 1]).ravel())
+    directions_b = _angles_to_unit_vectors((angles_b[:, [0]] + combinations[:, 2]).ravel(),
+                                           (angles_b[:, [1]] + combinations[:, 3]).ravel())
+
+    # Find the closest point between the lines of each pair and combination in a single batch
+    deviated_points = closest_points_between_line_pairs(np.repeat(positions_a, number_of_combinations, axis=0),
+                                                        directions_a,
+                                                        np.repeat(positions_b, number_of_combinations, axis=0),
+                                                        directions_b)
+
+    # Keep the largest distance to the target among the combinations of each pair
     errors = np.linalg.norm(deviated_points - target_position, axis=1)
+    errors = errors.reshape(-1, number_of_combinations).max(axis=1)
 
-    # Return the maximum error among all deviations
-    return max(errors)
+    return errors
 
 
 def convert_angles_to_unit_vectors(angles_1, angles_2):
@@ -217,22 +333,93 @@ def convert_angles_to_unit_vectors(angles_1, angles_2):
     azimuth_1, elevation_1 = angles_1
     azimuth_2, elevation_2 = angles_2
 
-    # Convert angles from degrees to radians
-    azimuth_1_rad, elevation_1_rad = np.deg2rad(azimuth_1), np.deg2rad(elevation_1)
-    azimuth_2_rad, elevation_2_rad = np.deg2rad(azimuth_2), np.deg2rad(elevation_2)
-
     # Compute the components of the unit vectors
-    u1 = np.array([np.cos(azimuth_1_rad) * np.cos(elevation_1_rad),
-                   np.sin(azimuth_1_rad) * np.cos(elevation_1_rad),
-                   np.sin(elevation_1_rad)])
-
-    u2 = np.array([np.cos(azimuth_2_rad) * np.cos(elevation_2_rad),
-                   np.sin(azimuth_2_rad) * np.cos(elevation_2_rad),
-                   np.sin(elevation_2_rad)])
+    u1 = _unit_vector(float(azimuth_1), float(elevation_1))
+    u2 = _unit_vector(float(azimuth_2), float(elevation_2))
 
     return u1, u2
 
 
+def _angles_to_unit_vectors(azimuths, elevations):
+    """
+    Vectorized conversion of azimuth and elevation angles to unit direction vectors.
+    @param azimuths: (numpy.ndarray) Azimuth angles in degrees.
+    @param elevations: (numpy.ndarray) Elevation angles in degrees.
+    @return: (numpy.ndarray) An (N, 3) array of unit vectors.
+    """
+    azimuths_rad = azimuths * _DEG2RAD
+    elevations_rad = elevations * _DEG2RAD
+    cos_elevations = np.cos(elevations_rad)
+    return np.column_stack([np.cos(azimuths_rad) * cos_elevations,
+                            np.sin(azimuths_rad) * cos_elevations,
+                            np.sin(elevations_rad)])
+
+
+def closest_points_between_line_pairs(points1, directions1, points2, directions2):
+    """
+    Find the closest point between each pair of lines in a batch.
+
+    Vectorized counterpart of closest_point_between_lines: row k of the inputs defines the k-th pair of lines. The
+    least-squares point of two lines is the midpoint of their common perpendicular, which is computed in closed form.
+
+    Args:
+        @param points1: (numpy.ndarray) An (N, 3) array of points on the first lines.
+        @param directions1: (numpy.ndarray) An (N, 3) array of direction vectors of the first lines.
+        @param points2: (numpy.ndarray) An (N, 3) array of points on the second lines.
+        @param directions2: (numpy.ndarray) An (N, 3) array of direction vectors of the second lines.
+
+    Returns:
+        @return numpy.ndarray: An (N, 3) array of the closest points.
+
+    Raises:
+        @raise LinAlgError: If any pair of lines is parallel, or nearly parallel.
+    """
+    # A compiled loop over the pairs avoids the temporaries of the array expressions below
+    if _HAS_NUMBA:
+        closest_points = np.empty([len(points1), 3])
+        if not _closest_points_loop(np.ascontiguousarray(points1, dtype=np.float64),
+                                    np.ascontiguousarray(directions1, dtype=np.float64),
+                                    np.ascontiguousarray(points2, dtype=np.float64),
+                                    np.ascontiguousarray(directions2, dtype=np.float64), closest_points):
+            raise np.linalg.LinAlgError("The lines are parallel, or nearly parallel.")
+        return closest_points
+
+    w = points1 - points2
+    a = np.einsum('ij,ij->i', directions1, directions1)
+    b = np.einsum('ij,ij->i', directions1, directions2)
+    c = np.einsum('ij,ij->i', directions2, directions2)
+    d = np.einsum('ij,ij->i', directions1, w)
+    e = np.einsum('ij,ij->i', directions2, w)
+
+    # Raise LinAlgError if any pair is singular, i.e. its lines are parallel or anti-parallel up to rounding
+    denominator = a * c - b * b
+    if np.any(denominator <= _SINGULARITY_TOLERANCE * a * c):
+        raise np.linalg.LinAlgError("The lines are parallel, or nearly parallel.")
+
+    # Parameters of the feet of the common perpendicular on each line
+    t1 = (b * e - c * d) / denominator
+    t2 = (a * e - b * d) / denominator
+
+    return (points1 + t1[:, None] * directions1 + points2 + t2[:, None] * directions2) / 2
+
+
+@njit(cache=True)
+def _closest_points_loop(points1, directions1, points2, directions2, out):
+    """
+    Compiled kernel of closest_points_between_line_pairs, a single loop over the pairs of lines.
+    @param points1: (numpy.ndarray) An (N, 3) float64 array of points on the first lines.
+    @param directions1: (numpy.ndarray) An (N, 3) float64 array of direction vectors of the first lines.
+    @param points2: (numpy.ndarray) An (N, 3) float64 array of points on the second lines.
+    @param directions2: (numpy.ndarray) An (N, 3) float64 array of direction vectors of the second lines.
+    @param out: (numpy.ndarray) An (N, 3) float64 array to store the closest points in.
+    @return: (bool) False if any pair of lines is parallel, or nearly parallel.
+    """
+    for i in range(points1.shape[0]):
+        if not _closest_point(points1[i], directions1[i], points2[i], directions2[i], out[i]):
+            return False
+    return True
+
+
 def closest_point_between_lines(line1, line2):
     """
     Find the closest point between two lines.
@@ -256,42 +443,83 @@ def closest_point_between_lines(line1, line2):
     point1, direction1 = line1
     point2, direction2 = line2
 
-    # Convert the points to numpy arrays, and add a zero to the end if necessary
-    pre_proc = lambda x: np.array(x) if len(x) == 3 else np.array(list(x) + [0])
+    # Convert the points to float numpy arrays, and add a zero to the end if necessary
+    pre_proc = lambda x: np.asarray(x if len(x) == 3 else list(x) + [0], dtype=np.float64)
 
     point1 = pre_proc(point1)
     point2 = pre_proc(point2)
     direction1 = pre_proc(direction1)
     direction2 = pre_proc(direction2)
 
-    # Raise LinAlgError if the system of linear equations is singular
-    if np.linalg.norm(direction2 - direction1) < 1e-6:
+    # Raise LinAlgError if the system of linear equations is singular, i.e. the lines are parallel or anti-parallel
+    closest_point = np.empty(3)
+    if not _closest_point(point1, direction1, point2, direction2, closest_point):
         raise np.linalg.LinAlgError("The lines are parallel, or nearly parallel.")
 
-    # Construct the matrix G
-    G = np.zeros([6, 5])
-    G[:3, :3] = np.eye(3)
-    G[3:, :3] = np.eye(3)
-    G[:3, 3] = -direction1
-    G[3:, 4] = -direction2
+    return closest_point
 
-    # Construct the vector d
-    d = np.concatenate([point1, point2])
 
-    # Calculate the parameters 'm' using least squares
-    m = np.linalg.inv(G.T @ G) @ G.T @ d
+@njit(cache=True)
+def _unit_vector(azimuth, elevation):
+    """
+    Compiled kernel of convert_angles_to_unit_vectors for a single pair of angles.
+    @param azimuth: (float) Azimuth angle in degrees.
+    @param elevation: (float) Elevation angle in degrees.
+    @return: (numpy.ndarray) The unit vector, of shape (3,).
+    """
+    azimuth_rad = azimuth * _DEG2RAD
+    elevation_rad = elevation * _DEG2RAD
+    cos_elevation = math.cos(elevation_rad)
 
-    # Extract the coordinates of the closest point
-    closest_point = m[:3]
+    unit_vector = np.empty(3)
+    unit_vector[0] = math.cos(azimuth_rad) * cos_elevation
+    unit_vector[1] = math.sin(azimuth_rad) * cos_elevation
+    unit_vector[2] = math.sin(elevation_rad)
+    return unit_vector
 
-    return closest_point
+
+@njit(cache=True)
+def _closest_point(point1, direction1, point2, direction2, out):
+    """
+    Compiled kernel of closest_point_between_lines for two 3D lines given as float64 arrays of shape (3,).
+    @param point1: (numpy.ndarray) A point on the first line.
+    @param direction1: (numpy.ndarray) The direction vector of the first line.
+    @param point2: (numpy.ndarray) A point on the second line.
+    @param direction2: (numpy.ndarray) The direction vector of the second line.
+    @param out: (numpy.ndarray) An array of shape (3,) to store the closest point between the two lines in.
+    @return: (bool) False if the lines are parallel, or nearly parallel, in which case out is left untouched.
+    """
+    # The least squares problem G m = d, with G = [[I, -direction1, 0], [I, 0, -direction2]] and d = [point1, point2],
+    # reduces to a 2x2 system in the line parameters, which is solved in closed form (Cramer's rule)
+    a = b = c = d = e = 0.0
+    for k in range(3):
+        w = point1[k] - point2[k]
+        a += direction1[k] * direction1[k]
+        b += direction1[k] * direction2[k]
+        c += direction2[k] * direction2[k]
+        d += direction1[k] * w
+        e += direction2[k] * w
+    denominator = a * c - b * b
+    if denominator <= _SINGULARITY_TOLERANCE * a * c:
+        return False
+    t1 = (b * e - c * d) / denominator
+    t2 = (a * e - b * d) / denominator
+
+    # The closest point is the midpoint of the common perpendicular of the two lines
+    for k in range(3):
+        out[k] = (point1[k] + t1 * direction1[k] + point2[k] + t2 * direction2[k]) / 2
+    return True
 
 
 def weighted_estimation(points, weights):
     """
-    Computes the weighted average of a set of points.
-    @param points: (np.array) An array containing the points to be averaged.
-    @param weights: (np.array) An array containing the weights of each point.
-    @return: (np.array) The weighted average of the points.
+    Computes the weighted average of a set of points, or of K sets of points at once.
+    @param points: (np.array) An (N, D) array of the points to be averaged, or an (N, D, K) array of K such sets.
+    @param weights: (np.array) An (N,) array of the weights of each point, or an (N, K) array of the weights of
+                    each set.
+    @return: (np.array) The (D,) weighted average of the points, or a (K, D) array of the weighted average of each set.
     """
-    return (points.T * weights).sum(axis=1) / weights.sum()
+    points = np.asarray(points, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    return np.einsum('nd...,n...->...d', points, weights) / weights.sum(axis=0)[..., None]
@@ -42,50 +42,50 @@ def estimate_position(cameras_list, pixels_by_camera):
         @return: numpy.ndarray: A 2D array representing the estimated positions.
                  Each row corresponds to a measurement, and the columns represent the X, Y, and Z coordinates.
     """
+    # Look up the camera names once
+    camera_names = [camera['name'] for camera in cameras_list]
+
     # Determine the number of measurements
-    if not isinstance(pixels_by_camera[cameras_list[0]['name']], list):
+    if not isinstance(pixels_by_camera[camera_names[0]], list):
         number_of_measurements = 1
     else:
-        number_of_measurements = len(pixels_by_camera[cameras_list[0]['name']])
+        number_of_measurements = len(pixels_by_camera[camera_names[0]])
 
     expected_angles = {}
 
     # Calculate the expected angles for each camera
-    for camera in cameras_list:
+    for camera, camera_name in zip(cameras_list, camera_names):
         expected_angles_for_camera = []
 
         # Validate that the pixel is iterable
-        if not isinstance(pixels_by_camera[camera['name']], list):
-            pixels_by_camera[camera['name']] = [pixels_by_camera[camera['name']]]
+        if not isinstance(pixels_by_camera[camera_name], list):
+            pixels_by_camera[camera_name] = [pixels_by_camera[camera_name]]
+        camera_pixels = pixels_by_camera[camera_name]
+        azimuth_calibration = camera['calibration']['azimuth']
+        elevation_calibration = camera['calibration']['elevation']
 
-        for pixel in pixels_by_camera[camera['name']]:
-            expected_angles_for_camera.append(calib_functions.pixel2phi(camera['calibration'], pixel))
+        for pixel_horizontal, pixel_vertical in camera_pixels:
+            expected_angles_for_camera.append(calib_functions.pixel2phi_pair(
+                azimuth_calibration, elevation_calibration, pixel_horizontal, pixel_vertical))
 
-        expected_angles[camera['name']] = expected_angles_for_camera
+        expected_angles[camera_name] = expected_angles_for_camera
 
-    pixel_dim = len(pixels_by_camera[camera['name']][0])
+    pixel_dim = len(pixels_by_camera[camera_names[-1]][0])
     dimensions = pixel_dim + 1  # Recall that a 2D image represents 3D space
 
     # Initialize the array to store points and weights for each pair of cameras
-    points_weights_by_pairs = np.zeros([math.comb(len(cameras_list), 2), dimensions + 1, number_of_measurements])
+    points_weights_by_pairs = np.empty([math.comb(len(cameras_list), 2), dimensions + 1, number_of_measurements])
 
     # Perform triangulation for each measurement
     for k in range(number_of_measurements):
-        angle_by_camera = {}
-        for m in range(len(cameras_list)):
-            camera_name = cameras_list[m]['name']
-            angle_by_camera[camera_name] = expected_angles[camera_name][k]
+        angle_by_camera = {camera_name: expected_angles[camera_name][k] for camera_name in camera_names}
 
         points_weights_by_pairs[:, :, k] = estim_functions.triangulation_by_pairs(cameras_list, angle_by_camera)
 
-    # Perform weighted estimation for each measurement
-    results = np.zeros([number_of_measurements, dimensions])
-    for k in range(number_of_measurements):
-        relevant_points = points_weights_by_pairs[:, :dimensions, k]
-        relevant_weights = points_weights_by_pairs[:, dimensions, k]
-        relevant_weights = 1 / relevant_weights
-        relevant_weights = relevant_weights / np.linalg.norm(relevant_weights)
-        results[k, :] = estim_functions.weighted_estimation(relevant_points, relevant_weights)
+    # Perform weighted estimation for all measurements at once, weighting each pair by its inverse error. The
+    # weighted average is invariant to the scale of the weights, so they need no normalization
+    results = estim_functions.weighted_estimation(points_weights_by_pairs[:, :dimensions, :],
+                                                  1 / points_weights_by_pairs[:, dimensions, :])
 
     return results
 
@@ -115,17 +115,17 @@ def simulate_data(cameras_list, points, noise_std):
 
     # Loop through each camera in the cameras_list
     for camera in cameras_list:
-        # Create an empty list to store the measurements for this camera
-        measurements_by_camera = []
-        # Loop through each point in the points list
-        for point in points:
-            # Convert the 3D point to pixel coordinates in the camera image plane
-            pixel = sim_functions.point2pixel(point, camera)
-            # Add Gaussian noise to the pixel coordinates
-            measurements_by_camera.append(sim_functions.add_white_gaussian_noise(pixel, noise_std))
+        # Convert all the 3D points to pixel coordinates in the camera image plane at once
+        expected_azimuths, expected_elevations = np.atleast_1d(
+            *calib_functions.calculate_expected_angles(camera, points))
+        pixels = np.column_stack([sim_functions.phi2pixel(expected_azimuths, camera['calibration']['azimuth']),
+                                  sim_functions.phi2pixel(expected_elevations, camera['calibration']['elevation'])])
+
+        # Add Gaussian noise to the pixel coordinates
+        noisy_pixels = sim_functions.add_white_gaussian_noise(pixels, noise_std)
 
         # Add the measurements for this camera to the measurements dictionary
-        measurements[camera['name']] = measurements_by_camera
+        measurements[camera['name']] = [tuple(pixel) for pixel in noisy_pixels.tolist()]
 
     return measurements
 
@@ -143,7 +143,9 @@ def simulate_calibration(cameras_list, calibration_points, angle_error_std=5, pi
 
     updated_cameras_data = []
     for camera in cameras_list:
-        expected_azimuths, expected_elevations = calib_functions.calculate_expected_angles(camera, calibration_points)
+        # The simulated deployment and pixel errors dwarf the error of the fast arctan2 approximation
+        expected_azimuths, expected_elevations = calib_functions.calculate_expected_angles(camera, calibration_points,
+                                                                                           fast=True)
 
         azimuth_error = np.random.normal(0, angle_error_std)
         elevation_error = np.random.normal(0, angle_error_std)
@@ -158,11 +160,13 @@ def simulate_calibration(cameras_list, calibration_points, angle_error_std=5, pi
             (azimuths_with_deployment_error, elevations_with_deployment_error),
             camera['angle_of_view'], camera['resolution'], pixel_error_std)
 
+        # Fit the azimuth and elevation axes together, one column each
+        slopes, intercepts, r_squared = calib_functions.calculate_calibration_params(
+            expected_pixels, np.column_stack([expected_azimuths, expected_elevations]))
+
         camera['calibration'] = {}
-        camera['calibration']['azimuth'] = calib_functions.calculate_calibration_params(
-            expected_pixels[:, 0], expected_azimuths)
-        camera['calibration']['elevation'] = calib_functions.calculate_calibration_params(
-            expected_pixels[:, 1], expected_elevations)
+        camera['calibration']['azimuth'] = (slopes[0], intercepts[0], r_squared[0])
+        camera['calibration']['elevation'] = (slopes[1], intercepts[1], r_squared[1])
 
         camera['calculated_azimuth'] = camera['azimuth'] + \
                                        camera['calibration']['azimuth'][1] - camera['angle_of_view'] / 2
@@ -318,9 +322,7 @@ if __name__ == '__main__':
 
     fig = plt.figure()
     ax = fig.add_subplot(projection='3d')
-    for point in points_as_list:
-        ax.scatter(point[0], point[1], point[2], marker='*', c='b')
-    for point in ps:
-        ax.scatter(point[0], point[1], point[2], marker='s', c='r')
+    ax.scatter(points[:, 0], points[:, 1], points[:, 2], marker='*', c='b')
+    ax.scatter(ps[:, 0], ps[:, 1], ps[:, 2], marker='s', c='r')
 
     fig.show()
@@ -6,17 +6,20 @@ def add_white_gaussian_noise(pixel, std):
     """
     Adds white Gaussian noise to a pixel value.
 
-    @param pixel: (int) The pixel value to add noise to.
+    @param pixel: (int, tuple of 2 ints or numpy.ndarray) The pixel value (or values) to add noise to.
     @param std: (float) The standard deviation of the noise.
-    @return: (int) The pixel value with added noise.
+    @return: (int, tuple of 2 ints or numpy.ndarray) The pixel value (or values) with added noise.
     """
     if isinstance(pixel, int):
         s = normal(0, std)
         return int(pixel + s)
+    elif isinstance(pixel, np.ndarray):
+        # One noise sample per element, truncated towards zero like int()
+        return np.trunc(pixel + normal(0, std, pixel.shape)).astype(int)
     elif isinstance(pixel, tuple) and len(pixel) == 2:
         return add_white_gaussian_noise(pixel[0], std), add_white_gaussian_noise(pixel[1], std)
-    else: # Raise an error if the pixel is not an integer or tuple of length 2
-        raise TypeError("pixel must be an integer or tuple of length 2.")
+    else: # Raise an error if the pixel is not an integer, tuple of length 2 or array
+        raise TypeError("pixel must be an integer, tuple of length 2 or numpy array.")
 
 
 def point2pixel(point, camera_data):
@@ -44,15 +47,15 @@ def phi2pixel(phi, calibration_data):
     """
     Converts an azimuth angle to a pixel value for a given camera.
 
-    @param phi: (float) The azimuth angle in degrees.
+    @param phi: (float or array-like) The azimuth angle (or angles) in degrees.
     @param calibration_data: (tuple) A tuple containing the slope and intercept of the calibration data.
-    @return: (int) The pixel value representation of the azimuth angle.
+    @return: (int or numpy.ndarray) The pixel value representation of the azimuth angle.
     """
     slope = calibration_data[0]
     intercept = calibration_data[1]
 
-    pixel = round((phi - intercept) / slope)
-    return pixel
+    pixel = np.round((np.asarray(phi) - intercept) / slope).astype(int)
+    return int(pixel) if pixel.ndim == 0 else pixel
 
 
 def generate_3d_points(function, x_range, y_range, z_range, density):
@@ -84,14 +87,8 @@ def generate_3d_points(function, x_range, y_range, z_range, density):
     y_filtered = y_values[mask]
     z_filtered = z_values[mask]
 
-    # Create a list to store the generated points
-    points = []
-
-    # Iterate over the filtered values and add them as tuples to the points list
-    for i in range(len(x_filtered)):
-        points.append((x_filtered[i], y_filtered[i], z_filtered[i]))
-
-    return points
+    # Pair the filtered values up as (x, y, z) tuples
+    return list(zip(x_filtered, y_filtered, z_filtered))
 
 
 def calculate_expected_pixels(expected_angles, angle_of_view, image_size, std):
@@ -118,24 +115,20 @@ def calculate_expected_pixels(expected_angles, angle_of_view, image_size, std):
     if len(expected_azimuths) != len(expected_elevations):
         raise ValueError('The number of azimuths and elevations must be equal.')
 
-    n = len(expected_azimuths)
+    expected_azimuths = np.asarray(expected_azimuths, dtype=np.float64)
+    expected_elevations = np.asarray(expected_elevations, dtype=np.float64)
 
     horizontal_pixels_number = image_size[0]
     vertical_pixels_number = image_size[1]
 
-    expected_pixels = np.zeros([n, 2])
+    expected_pixels = np.empty([len(expected_azimuths), 2])
 
-    # Calculate the expected pixel positions for each angle
-    for i in range(n):
-        azimuth = expected_azimuths[i]
-        elevation = expected_elevations[i]
+    # Convert all angles to pixel positions at once
+    expected_pixels[:, 0] = np.round((0.5 - expected_azimuths / angle_of_view) * (horizontal_pixels_number - 1))
+    expected_pixels[:, 1] = np.round((0.5 - expected_elevations / angle_of_view) * (vertical_pixels_number - 1))
 
-        # Convert angle to pixel position
-        pixel_horizontal = round((0.5 - azimuth/angle_of_view) * (horizontal_pixels_number - 1))
-        pixel_vertical = round((0.5 - elevation / angle_of_view) * (vertical_pixels_number - 1))
-
-        expected_pixels[i, 0] = add_white_gaussian_noise(pixel_horizontal, std)
-        expected_pixels[i, 1] = add_white_gaussian_noise(pixel_vertical, std)
+    # Add white Gaussian noise, drawn in the same (point, axis) order as add_white_gaussian_noise would
+    expected_pixels = np.trunc(expected_pixels + normal(0, std, expected_pixels.shape))
 
     return expected_pixels
 
@@ -153,8 +146,4 @@ def generate_calibration_points(x_limits, y_limits, z_limits, number_of_points):
     random_y_values = np.random.uniform(y_limits[0], y_limits[1], number_of_points)
     random_z_values = np.random.uniform(z_limits[0], z_limits[1], number_of_points)
 
-    result = []
-    for i in range(number_of_points):
-        result.append((random_x_values[i], random_y_values[i], random_z_values[i]))
-
-    return result
+    return list(zip(random_x_values, random_y_values, random_z_values))